@@ -7,7 +7,7 @@
     Features:
         - Multi-format audio file processing (configurable)
         - Efficient tag extraction with pytaglib (fallback to mutagen)
-        - Intelligent duplicate detection and handling
+        - Intelligent duplicate detection and handling (BLAKE3 hashing when available, SHA256 fallback)
         - Configurable logging with file and console output
         - Command-line and configuration file support
         - INI-based configuration for logging and audio formats
@@ -20,6 +20,7 @@
         - [logging]: log level, file path, format, console output
         - [audio_formats]: supported file extensions
         - [playlists]: playlist generation settings, name template, and directory
+        - [performance]: number of processes used for tag reading and threads used for duplicate hashing, tag cache file
     
     Usage:
         `python mp3tags.py -S "C:\\Music\\Unsorted" -T "C:\\Music\\Organized"`
@@ -35,11 +36,25 @@ Keyword arguments:
     Functions:
         setup_logging(verbose, quiet, log_file, config) -- Configures logging based on parameters and INI config.
         get_audio_extensions(config) -- Gets audio file extensions from INI config or returns defaults.
+        get_hash_workers(config) -- Gets the number of duplicate hashing threads from INI config or returns the default.
+        get_tag_workers(config) -- Gets the number of tag reading processes from INI config or returns the default.
+        get_tag_cache_path(config) -- Gets the path of the SQLite tag cache from INI config, or None if disabled.
         rename_files(directory, logger, audio_extensions) -- Renames audio files in the specified directory based on their metadata tags.
-        rename_files_in_subdirectories(source_directory, logger, audio_extensions) -- Renames audio files in all subdirectories of the specified source directory.
-        audio_tag(filename, logger) -- Extracts the tags from an audio file using pytaglib (preferred) or mutagen (fallback).
+        rename_files_in_subdirectories(source_directory, logger, audio_extensions, max_workers) -- Renames audio files in the source directory and all subdirectories in parallel.
+        first_tag(tags, keys) -- Returns the value of the first present tag key from a priority list.
+        audio_tag(filename, logger) -- Extracts the tags, bit rate, length and size of an audio file into a TrackTags using pytaglib (preferred) or mutagen (fallback).
+        extract_tags_worker(filepath) -- Reads the tags of one audio file inside a worker process.
+        read_tags(paths, logger, max_workers, tag_cache) -- Reads the tags of several audio files, optionally in parallel processes and through the tag cache.
+        file_bitrate(filepath, logger) -- Returns the exact bit rate of an audio file from mutagen.
+        storage_bitrate(filepath, logger, bitrate_cache, tag_cache) -- Returns the bit rate of an audio file in storage, cached for files moved during the run and in the tag cache.
         clean_string(s) -- Cleans a string by removing invalid characters for filenames.
-        file_hash(filepath, chunk_size=8192) -- Computes SHA256 hash of a file.
+        file_hash(filepath, chunk_size=1048576) -- Computes BLAKE3 (or SHA256 fallback) hash of a file.
+        prefix_hash(filepath, prefix_size) -- Computes SHA256 hash of the first bytes of a file.
+        hash_files(paths, logger, max_workers, prefix_only) -- Hashes files, optionally in parallel threads.
+        find_duplicates(groups, logger, max_workers) -- Finds identical files among same-size groups by prefix, then full hashes, as (duplicate, kept) pairs.
+        dedupe_directory(directory, audio_extensions, logger, max_workers, tag_cache, bitrate_cache) -- Removes identical audio files from a directory.
+        iter_audio_files(root, audio_extensions) -- Yields every audio file under a directory tree using os.scandir.
+        playlist_entry(filepath, file_info, original_filename) -- Builds a playlist file info dictionary with the display fields resolved once.
         generate_playlists(all_files, storage_directory, logger, config, playlist_name, playlist_dir_override) -- Generates a playlist based on all processed files.
         main(source_directory, storage_directory, logger, audio_extensions, config, playlist_name, playlist_dir) -- Main function to process audio files and organize them into the storage directory.
 
@@ -47,7 +62,7 @@ Keyword arguments:
         source_directory -- The directory containing the audio files to be processed.
         storage_directory -- The directory where the renamed audio files will be stored.
         logger -- Logger instance for outputting messages.
-        audio_extensions -- Tuple of supported audio file extensions.
+        audio_extensions -- Frozenset of supported lowercase audio file extensions.
 
     Returns:
         None
@@ -60,18 +75,42 @@ TODO:
 
 
 import os
+import sys
+import errno
 import argparse
 import shutil
 import time
 import hashlib
+import mmap
 import configparser
+import importlib.util
 import logging
+import logging.handlers
+import multiprocessing
+import json
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
 try:
     import taglib
     PYTAGLIB_AVAILABLE = True
 except ImportError:
     PYTAGLIB_AVAILABLE = False
-from mutagen import File
+try:
+    import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+# mutagen is imported on first use in audio_tag, so runs served by pytaglib never load it; it is still
+# required, as the exact bit rates that decide between duplicates are only read with mutagen
+MUTAGEN_AVAILABLE = importlib.util.find_spec('mutagen') is not None
+
+# Audio file extensions processed when none are configured, lowercase with the leading dot
+DEFAULT_AUDIO_EXTENSIONS = frozenset(('.mp3', '.flac', '.ogg', '.mp4', '.m4a', '.wma', '.aac', '.opus'))
+
+# Translation tables replacing characters that are invalid (or unwanted) in filenames with spaces
+_TITLE_TABLE = str.maketrans({c: ' ' for c in '/\\:*?"<>|!'})
+_CLEAN_TABLE = str.maketrans({c: ' ' for c in '/\\:*?"<>|!()[]{}@#$%^&=+`~'})
 
 def setup_logging(verbose=False, quiet=False, log_file='mp3tags.log', config=None):
     """Setup logging configuration and return logger instance."""
@@ -111,9 +150,10 @@ def setup_logging(verbose=False, quiet=False, log_file='mp3tags.log', config=Non
     return logging.getLogger(__name__)
 
 def get_audio_extensions(config=None):
-    """Get audio file extensions from config or return defaults."""
-    default_extensions = ('.mp3', '.flac', '.ogg', '.mp4', '.m4a', '.wma', '.aac', '.opus')
-    
+    """
+    Get audio file extensions from config or return defaults.
+    Returns a frozenset of lowercase extensions (with the leading dot) for O(1) membership tests.
+    """
     if config:
         try:
             extensions_str = config.get('audio_formats', 'extensions', fallback=None)
@@ -125,11 +165,57 @@ def get_audio_extensions(config=None):
                     if not ext.startswith('.'):
                         ext = '.' + ext
                     extensions.append(ext)
-                return tuple(extensions)
+                return frozenset(extensions)
+        except (configparser.NoSectionError, configparser.NoOptionError):
+            pass
+    
+    return DEFAULT_AUDIO_EXTENSIONS
+
+def get_hash_workers(config=None):
+    """Get the number of threads used for duplicate hashing from config or return the default."""
+    default_workers = min(8, os.cpu_count() or 1)
+    
+    if config:
+        try:
+            return max(1, config.getint('performance', 'hash_workers', fallback=default_workers))
+        except (configparser.NoSectionError, configparser.NoOptionError, ValueError):
+            pass
+    
+    return default_workers
+
+def get_tag_workers(config=None):
+    """Get the number of processes used for tag reading from config or return the default."""
+    default_workers = os.cpu_count() or 1
+    
+    if config:
+        try:
+            return max(1, config.getint('performance', 'tag_workers', fallback=default_workers))
+        except (configparser.NoSectionError, configparser.NoOptionError, ValueError):
+            pass
+    
+    return default_workers
+
+def get_tag_cache_path(config=None):
+    """Get the path of the SQLite tag cache from config, or None if caching is disabled."""
+    if config:
+        try:
+            return config.get('performance', 'tag_cache', fallback='').strip() or None
         except (configparser.NoSectionError, configparser.NoOptionError):
             pass
     
-    return default_extensions
+    return None
+
+def _fast_move(src: str, dst: str) -> None:
+    """
+    Moves a file with a single atomic rename, falling back to shutil.move (copy and delete)
+    when source and destination are on different filesystems.
+    """
+    try:
+        os.replace(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(src, dst)
 
 def rename_files(directory: str, logger: logging.Logger, audio_extensions=None) -> None:
     """
@@ -139,76 +225,108 @@ def rename_files(directory: str, logger: logging.Logger, audio_extensions=None)
     Supports: MP3, FLAC, OGG, MP4/M4A, WMA, AAC, OPUS
     """
     if audio_extensions is None:
-        audio_extensions = ('.mp3', '.flac', '.ogg', '.mp4', '.m4a', '.wma', '.aac', '.opus')
+        audio_extensions = DEFAULT_AUDIO_EXTENSIONS
     
-    for filename in os.listdir(directory):
-        if filename.lower().endswith(audio_extensions):
-            file_path = os.path.join(directory, filename)
-            try:
-                audio = File(file_path)
-                if audio is not None and audio.tags:
-                    title = None
-                    if hasattr(audio.tags, 'get'):
-                        title = (audio.tags.get('TIT2') or 
-                                audio.tags.get('TITLE') or 
-                                audio.tags.get('\xa9nam'))  # iTunes format
+    # Snapshot the listing first, files are renamed while iterating
+    with os.scandir(directory) as it:
+        all_entries = list(it)
+    # Match on the lowercased extension only instead of lowercasing every filename
+    entries = [entry for entry in all_entries if entry.name[entry.name.rfind('.'):].lower() in audio_extensions and entry.is_file()]
+    # Names taken in the directory, probed before stat'ing a candidate. normcase only folds case on Windows,
+    # so the final candidate is still confirmed with os.path.exists (case-insensitive macOS/FAT/SMB, NFC/NFD names)
+    existing = {os.path.normcase(entry.name) for entry in all_entries}
+    
+    for entry in entries:
+        filename = entry.name
+        file_path = entry.path
+        try:
+            # audio_tag reads with pytaglib when available and resolves the ID3/Vorbis/iTunes title keys
+            title = audio_tag(file_path, logger).title
+            if title:
+                # Replace invalid characters for filenames
+                title = title.translate(_TITLE_TABLE)
+                # The name matched an audio extension, so it has a dot
+                file_extension = filename[filename.rfind('.'):]
+                new_filename = f"{title}{file_extension}"
+                new_file_path = os.path.join(directory, new_filename)
+                
+                # Check if file already exists and if it's already correctly named
+                if file_path != new_file_path:
+                    count = 1
+                    while (os.path.normcase(new_filename) in existing
+                           or os.path.exists(os.path.join(directory, new_filename))):
+                        new_filename = f"{title} ({count}){file_extension}"
+                        count += 1
+                    new_file_path = os.path.join(directory, new_filename)
                     
-                    if title:
-                        if hasattr(title, 'text'):
-                            title = title.text[0] if title.text else None
-                        elif isinstance(title, list):
-                            title = title[0] if title else None
-                        elif isinstance(title, str):
-                            title = title
-                        
-                        if title:
-                            # Replace invalid characters for filenames
-                            title = title.replace('/', ' ').replace('\\', ' ').replace(':', ' ').replace('*', ' ').replace('?', ' ').replace('"', ' ').replace('<', ' ').replace('>', ' ').replace('|', ' ').replace('!', ' ')
-                            file_extension = os.path.splitext(filename)[1]
-                            new_filename = f"{title}{file_extension}"
-                            new_file_path = os.path.join(directory, new_filename)
-                            
-                            # Check if file already exists and if it's already correctly named
-                            if file_path != new_file_path:
-                                count = 1
-                                while os.path.exists(new_file_path):
-                                    new_filename = f"{title} ({count}){file_extension}"
-                                    new_file_path = os.path.join(directory, new_filename)
-                                    count += 1
-                                
-                                shutil.move(file_path, new_file_path)
-                                logger.info(f"Renamed '{filename}' to '{new_filename}'")
-            except Exception as e:
-                logger.error(f"Error processing {filename}: {e}")
+                    _fast_move(file_path, new_file_path)
+                    existing.discard(os.path.normcase(filename))
+                    existing.add(os.path.normcase(new_filename))
+                    logger.info("Renamed '%s' to '%s'", filename, new_filename)
+        except Exception as e:
+            logger.error("Error processing %s: %s", filename, e)
 
-def rename_files_in_subdirectories(source_directory: str, logger: logging.Logger, audio_extensions=None) -> None:
+def rename_files_in_subdirectories(source_directory: str, logger: logging.Logger, audio_extensions=None, max_workers=None) -> None:
     """
-    Renames audio files in all subdirectories of the specified source directory.
+    Renames audio files in the specified source directory and all of its subdirectories.
+    Directories are processed in parallel by a thread pool, each directory by exactly one worker.
     Supports: MP3, FLAC, OGG, MP4/M4A, WMA, AAC, OPUS
     """
-    for root, dirs, files in os.walk(source_directory):
-        for dir_name in dirs:
-            directory = os.path.join(root, dir_name)
-            rename_files(directory, logger, audio_extensions)
-        # Also check files in the source_directory itself
-        rename_files(root, logger, audio_extensions)
+    # os.walk yields every directory (the source directory included) once as root
+    directories = [root for root, dirs, files in os.walk(source_directory)]
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+        list(executor.map(lambda directory: rename_files(directory, logger, audio_extensions), directories))
+
+# Tag keys in order of preference: ID3, Vorbis/FLAC, iTunes
+_ARTIST_KEYS = ('TPE2', 'TPE1', 'ALBUMARTIST', 'ARTIST', '\xa9ART', 'aART')
+_TITLE_KEYS = ('TIT2', 'TITLE', '\xa9nam')
+_ALBUM_KEYS = ('TALB', 'ALBUM', '\xa9alb')
+# Track artist (not album artist), shown in playlists
+_TRACK_ARTIST_KEYS = ('TPE1', 'ARTIST', '\xa9ART')
+
+def first_tag(tags: dict, keys: tuple):
+    """Returns the value of the first of keys present in tags, or None."""
+    return next((tags[key] for key in keys if key in tags), None)
 
-def audio_tag(filename: str, logger: logging.Logger) -> dict:
+@dataclass(slots=True)
+class TrackTags:
+    """
+    Tags of an audio file, with artist, title and album resolved once from the format-specific keys.
+    bitrate is mutagen's exact stream bit rate in bps; it is None when pytaglib read the file (TagLib rounds to whole kb/s,
+    too coarse to compare files) or the file could not be parsed. length is in whole seconds, size is in bytes.
+    """
+    filename: str
+    tags: dict = field(default_factory=dict)
+    artist: str | None = None
+    title: str | None = None
+    album: str | None = None
+    bitrate: int | None = None
+    length: int | None = None
+    size: int | None = None
+
+    def resolve(self) -> 'TrackTags':
+        """Fills artist, title and album from the raw tags and returns self."""
+        self.artist = first_tag(self.tags, _ARTIST_KEYS)
+        self.title = first_tag(self.tags, _TITLE_KEYS)
+        self.album = first_tag(self.tags, _ALBUM_KEYS)
+        return self
+
+def audio_tag(filename: str, logger: logging.Logger) -> TrackTags:
     """
     Extracts the tags from an audio file using pytaglib (preferred) or Mutagen as fallback.
-    Returns a dictionary with the filename and its tags.
+    Returns a TrackTags with the filename, its tags, bit rate (bps), length (s) and size (bytes), read from the same parse.
+    The bit rate is only set when mutagen parsed the file (see TrackTags).
     Supports: MP3, FLAC, OGG, MP4/M4A, WMA, AAC, OPUS
     """
+    file_info = TrackTags(filename)
     try:
+        file_info.size = os.path.getsize(filename)
+        
         # Try pytaglib first for better performance
         if PYTAGLIB_AVAILABLE:
             try:
                 with taglib.File(filename) as f:
                     if f.tags:
-                        file_info = {
-                            'filename': filename,
-                            'tags': {}
-                        }
                         # Convert pytaglib tags to our expected format
                         tag_mapping = {
                             'TITLE': 'TIT2',
@@ -225,89 +343,442 @@ def audio_tag(filename: str, logger: logging.Logger) -> dict:
                             if value_list:  # Skip empty lists
                                 # Map to ID3 tag names for consistency
                                 mapped_key = tag_mapping.get(pytaglib_key.upper(), pytaglib_key)
-                                file_info['tags'][mapped_key] = value_list[0]
+                                file_info.tags[mapped_key] = value_list[0]
                                 
                                 # Also keep original key for compatibility
-                                file_info['tags'][pytaglib_key.upper()] = value_list[0]
+                                file_info.tags[pytaglib_key.upper()] = value_list[0]
                         
-                        logger.debug(f"Successfully extracted tags using pytaglib: {filename}")
-                        return file_info
+                        # TagLib's bit rate is whole kb/s; the exact bps is read with mutagen only if a comparison needs it
+                        file_info.length = f.length
+                        logger.debug("Successfully extracted tags using pytaglib: %s", filename)
+                        return file_info.resolve()
             except Exception as e:
-                logger.debug(f"pytaglib failed for {filename}, falling back to mutagen: {e}")
+                file_info.tags = {}
+                logger.debug("pytaglib failed for %s, falling back to mutagen: %s", filename, e)
         
         # Fallback to mutagen
+        from mutagen import File
         audio = File(filename)
+        file_info.bitrate = getattr(audio.info, 'bitrate', 0) if audio is not None and audio.info else 0
+        if audio is not None and audio.info and getattr(audio.info, 'length', None):
+            file_info.length = round(audio.info.length)
         if audio is not None and audio.tags:
-            file_info = {
-                'filename': filename,
-                'tags': {}
-            }
             for tag_key, tag_value in audio.tags.items():
                 if tag_key.startswith('APIC') or tag_key == 'covr':
                     continue  # Skip embedded images
                 if hasattr(tag_value, 'text'):
                     if tag_value.text:
-                        file_info['tags'][tag_key] = tag_value.text[0]
+                        file_info.tags[tag_key] = tag_value.text[0]
                     else:
-                        file_info['tags'][tag_key] = ''
+                        file_info.tags[tag_key] = ''
                 elif isinstance(tag_value, list):
-                    file_info['tags'][tag_key] = tag_value[0] if tag_value else ''
+                    file_info.tags[tag_key] = tag_value[0] if tag_value else ''
                 else:
-                    file_info['tags'][tag_key] = str(tag_value)
-            logger.debug(f"Successfully extracted tags using mutagen: {filename}")
-            return file_info
-        else:
-            return {"filename": filename, "tags": {}}
+                    file_info.tags[tag_key] = str(tag_value)
+            logger.debug("Successfully extracted tags using mutagen: %s", filename)
+        return file_info.resolve()
     except Exception as e:
-        logger.error(f"Error extracting tags from {filename}: {e}")
-        return {"filename": filename, "tags": {}}
+        logger.error("Error extracting tags from %s: %s", filename, e)
+        file_info.tags = {}
+        file_info.bitrate = None
+        return file_info
+
+class TagCache:
+    """
+    Sidecar SQLite cache of parsed tags and bit rates, keyed by path and only trusted while the file's mtime and size
+    are unchanged. Entries follow files moved into storage and are dropped when a file is removed, so later runs reuse
+    the bit rates of storage files (and the tags of files left in the source) without parsing them. Main process only.
+    The cache is best-effort: the first SQLite error (a locked or corrupt database) is logged and disables it for the
+    rest of the run, after which lookups miss and updates are skipped.
+    """
+
+    def __init__(self, db_path: str, logger: logging.Logger):
+        self.logger = logger
+        self.conn = sqlite3.connect(db_path)
+        try:
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('PRAGMA synchronous=NORMAL')
+            self.conn.execute('CREATE TABLE IF NOT EXISTS tags (path TEXT PRIMARY KEY, mtime INTEGER, size INTEGER, tags TEXT, bitrate INTEGER, length INTEGER)')
+        except sqlite3.Error:
+            self.conn.close()
+            raise
+
+    def _disable(self, e: sqlite3.Error) -> None:
+        """Logs a cache error and stops using the cache for the rest of the run."""
+        self.logger.warning("Tag cache disabled after error: %s", e)
+        try:
+            self.conn.close()
+        except sqlite3.Error:
+            pass
+        self.conn = None
+
+    def get(self, path: str, st: os.stat_result) -> TrackTags | None:
+        """Returns the cached TrackTags of path if it was stored for the same mtime and size, else None."""
+        if self.conn is None:
+            return None
+        try:
+            row = self.conn.execute('SELECT tags, bitrate, length FROM tags WHERE path = ? AND mtime = ? AND size = ? AND tags IS NOT NULL',
+                                    (path, st.st_mtime_ns, st.st_size)).fetchone()
+        except sqlite3.Error as e:
+            self._disable(e)
+            return None
+        if row is None:
+            return None
+        return TrackTags(path, json.loads(row[0]), bitrate=row[1], length=row[2], size=st.st_size).resolve()
+
+    def put_many(self, entries) -> None:
+        """Stores (path, stat_result, TrackTags) entries in one batch."""
+        if self.conn is None:
+            return
+        try:
+            self.conn.executemany('INSERT OR REPLACE INTO tags VALUES (?, ?, ?, ?, ?, ?)',
+                                  [(path, st.st_mtime_ns, st.st_size, json.dumps(info.tags, default=str), info.bitrate, info.length)
+                                   for path, st, info in entries])
+            self.conn.commit()
+        except sqlite3.Error as e:
+            self._disable(e)
+
+    def get_bitrate(self, path: str, st: os.stat_result) -> int | None:
+        """Returns the cached bit rate (bps) of path if one was stored for the same mtime and size, else None."""
+        if self.conn is None:
+            return None
+        try:
+            row = self.conn.execute('SELECT bitrate FROM tags WHERE path = ? AND mtime = ? AND size = ?',
+                                    (path, st.st_mtime_ns, st.st_size)).fetchone()
+        except sqlite3.Error as e:
+            self._disable(e)
+            return None
+        return row[0] if row is not None else None
+
+    def set_bitrate(self, path: str, st: os.stat_result, bitrate: int) -> None:
+        """Stores the bit rate of path, on its current entry or on a new bit-rate-only entry (tags left NULL)."""
+        if self.conn is None:
+            return
+        try:
+            cur = self.conn.execute('UPDATE tags SET bitrate = ? WHERE path = ? AND mtime = ? AND size = ?',
+                                    (bitrate, path, st.st_mtime_ns, st.st_size))
+            if cur.rowcount == 0:
+                self.conn.execute('INSERT OR REPLACE INTO tags VALUES (?, ?, ?, NULL, ?, NULL)',
+                                  (path, st.st_mtime_ns, st.st_size, bitrate))
+        except sqlite3.Error as e:
+            self._disable(e)
+
+    def move(self, src: str, dst: str, bitrate: int | None = None) -> None:
+        """
+        Re-keys the entry of a moved file, adding its bit rate if given;
+        renames and shutil.move keep mtime and size, so it stays valid.
+        """
+        if self.conn is None:
+            return
+        try:
+            self.conn.execute('UPDATE OR REPLACE tags SET path = ?, bitrate = COALESCE(?, bitrate) WHERE path = ?', (dst, bitrate, src))
+        except sqlite3.Error as e:
+            self._disable(e)
+
+    def discard(self, path: str) -> None:
+        """Drops the entry of a removed file."""
+        if self.conn is None:
+            return
+        try:
+            self.conn.execute('DELETE FROM tags WHERE path = ?', (path,))
+        except sqlite3.Error as e:
+            self._disable(e)
+
+    def close(self) -> None:
+        if self.conn is None:
+            return
+        try:
+            self.conn.commit()
+            self.conn.close()
+        except sqlite3.Error as e:
+            self._disable(e)
+        self.conn = None
+
+# Files each tag worker process must get before a pool is started; below that, process start-up
+# (a fresh interpreter per worker under the spawn start method, as on Windows) costs more than it saves
+TAG_POOL_MIN_FILES = 64
+# ProcessPoolExecutor refuses more than 61 workers on Windows
+_WIN32_MAX_WORKERS = 61
+
+def _init_tag_worker(log_queue, log_level: int) -> None:
+    """Routes the log records of a tag worker process through log_queue to the parent's handlers."""
+    root = logging.getLogger()
+    root.handlers = [logging.handlers.QueueHandler(log_queue)]
+    root.setLevel(log_level)
+
+def extract_tags_worker(filepath: str) -> TrackTags:
+    """Reads the tags of one file in a worker process; the result is a plain picklable TrackTags."""
+    return audio_tag(filepath, logging.getLogger(__name__))
+
+def read_tags(paths: list, logger: logging.Logger, max_workers: int = 1, tag_cache: TagCache | None = None) -> list:
+    """
+    Reads the tags of the given files with audio_tag, in parallel worker processes when max_workers > 1
+    and there are at least TAG_POOL_MIN_FILES files per worker.
+    Returns the TrackTags in the same order as paths. Tag parsing (mutagen especially) holds the GIL,
+    so processes rather than threads are used to spread it over the cores.
+    With a tag_cache, unchanged files are served from it and only the rest are parsed (and then stored).
+    """
+    results = [None] * len(paths)
+    stats = {}
+    if tag_cache is not None:
+        for i, fpath in enumerate(paths):
+            try:
+                stats[i] = os.stat(fpath)
+            except OSError:
+                continue
+            results[i] = tag_cache.get(fpath, stats[i])
+    misses = [i for i, info in enumerate(results) if info is None]
+    miss_paths = [paths[i] for i in misses]
+    if tag_cache is not None:
+        logger.debug("Tag cache: %s hits, %s misses", len(paths) - len(misses), len(misses))
+
+    workers = min(max_workers, len(miss_paths) // TAG_POOL_MIN_FILES)
+    if sys.platform == 'win32':
+        workers = min(workers, _WIN32_MAX_WORKERS)
+    if workers > 1:
+        # Batch paths per task so small files don't pay one round trip each, but keep every worker busy
+        chunksize = max(1, min(64, len(miss_paths) // (workers * 4)))
+        # Workers only queue their log records; one listener here writes them through the configured handlers
+        log_queue = multiprocessing.Queue()
+        listener = logging.handlers.QueueListener(log_queue, *logging.getLogger().handlers, respect_handler_level=True)
+        listener.start()
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_tag_worker,
+                                     initargs=(log_queue, logger.getEffectiveLevel())) as executor:
+                parsed = list(executor.map(extract_tags_worker, miss_paths, chunksize=chunksize))
+        finally:
+            listener.stop()
+    else:
+        parsed = [audio_tag(fpath, logger) for fpath in miss_paths]
+    for i, info in zip(misses, parsed):
+        results[i] = info
+
+    if tag_cache is not None:
+        # Files that could not be parsed (no tags and no bit rate) are not cached, so they are retried next run
+        tag_cache.put_many((paths[i], stats[i], results[i]) for i in misses
+                           if i in stats and (results[i].tags or results[i].bitrate is not None))
+    return results
+
+def file_bitrate(filepath: str, logger: logging.Logger) -> int | None:
+    """
+    Returns the exact bit rate (bps) of an audio file from mutagen's stream info, 0 if mutagen does not know the format,
+    or None if the file cannot be read. All bit rate comparisons use this one source so the values share a scale.
+    """
+    try:
+        from mutagen import File
+        audio = File(filepath)
+        return getattr(audio.info, 'bitrate', 0) if audio is not None and audio.info else 0
+    except Exception as e:
+        logger.error("Error reading bit rate of %s: %s", filepath, e)
+        return None
+
+def storage_bitrate(filepath: str, logger: logging.Logger, bitrate_cache: dict, tag_cache: TagCache | None = None) -> int:
+    """
+    Returns the bit rate (bps) of an audio file already in storage, or -1 if it cannot be read.
+    Files in bitrate_cache (the current run's {path: bitrate}), or unchanged since tag_cache recorded them, are not parsed again.
+    """
+    bitrate = bitrate_cache.get(filepath)
+    if bitrate is None:
+        st = None
+        if tag_cache is not None:
+            try:
+                st = os.stat(filepath)
+            except OSError:
+                return -1
+            bitrate = tag_cache.get_bitrate(filepath, st)
+        if bitrate is None:
+            bitrate = file_bitrate(filepath, logger)
+            if bitrate is None:
+                return -1
+            if st is not None:
+                tag_cache.set_bitrate(filepath, st, bitrate)
+        bitrate_cache[filepath] = bitrate
+    return bitrate
 
 def clean_string(s: str) -> str:
     """
     Cleans a string by removing invalid characters for filenames.    
     """
-    invalid_chars = ['/', '\\', ':', '*', '?', '"', '<', '>', '|', '!', '(', ')', '[', ']', '{', '}', '@', '#', '$', '%', '^', '&', '=', '+', '`', '~']
-    for char in invalid_chars:
-        s = s.replace(char, ' ')
-    return s.strip()
+    return s.translate(_CLEAN_TABLE).strip()
 
-def file_hash(filepath, chunk_size=8192):
-    """Compute SHA256 hash of a file."""
-    hasher = hashlib.sha256()
-    with open(filepath, 'rb') as f:
-        while chunk := f.read(chunk_size):
-            hasher.update(chunk)
+# Files at least this large are hashed through a read-only memory map (not on Windows)
+MMAP_THRESHOLD = 64 * 1024 * 1024
+
+def file_hash(filepath, chunk_size=1024 * 1024):
+    """
+    Compute a content hash of a file for duplicate detection.
+    Uses BLAKE3 when available (multi-threaded for files larger than chunk_size),
+    otherwise SHA256 via hashlib.file_digest (Python 3.11+) so the read/update loop runs in C.
+    Files of MMAP_THRESHOLD bytes or more are fed to the hash as one memory-mapped buffer,
+    anything else is read into a single reusable buffer of chunk_size bytes.
+    """
+    with open(filepath, 'rb', buffering=0) as f:
+        size = os.fstat(f.fileno()).st_size
+        use_mmap = size >= MMAP_THRESHOLD and sys.platform != 'win32'
+        if hasattr(os, 'posix_fadvise'):
+            # The whole file is read front to back, let the kernel read ahead aggressively
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        if BLAKE3_AVAILABLE:
+            hasher = blake3.blake3(max_threads=blake3.blake3.AUTO if size > chunk_size else 1)
+        else:
+            if not use_mmap and hasattr(hashlib, 'file_digest'):
+                return hashlib.file_digest(f, 'sha256').hexdigest()
+            hasher = hashlib.sha256()
+        if use_mmap and hasattr(hasher, 'update_mmap'):
+            # blake3 >= 0.4 maps the file itself and hashes the pages on its own thread pool
+            hasher.update_mmap(filepath)
+            return hasher.hexdigest()
+        if use_mmap:
+            with mmap.mmap(f.fileno(), 0, prot=mmap.PROT_READ) as mm:
+                if hasattr(mm, 'madvise'):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                hasher.update(mm)
+            return hasher.hexdigest()
+        buf = bytearray(chunk_size)
+        view = memoryview(buf)
+        while n := f.readinto(buf):
+            hasher.update(view[:n])
     return hasher.hexdigest()
 
-def collect_all_audio_files(storage_directory: str, audio_extensions: tuple, logger: logging.Logger) -> list:
+# Same-size files are first compared by a hash of this many leading bytes
+PREFIX_HASH_SIZE = 64 * 1024
+
+def prefix_hash(filepath, prefix_size=PREFIX_HASH_SIZE):
+    """Compute SHA256 hash of the first prefix_size bytes of a file."""
+    with open(filepath, 'rb') as f:
+        return hashlib.sha256(f.read(prefix_size)).hexdigest()
+
+def hash_files(paths: list, logger: logging.Logger, max_workers: int = 1, prefix_only: bool = False) -> dict:
+    """
+    Hashes the given files (only their first PREFIX_HASH_SIZE bytes if prefix_only),
+    in parallel threads when max_workers > 1, and returns {path: hash}.
+    Files that cannot be hashed are logged and left out of the result.
+    """
+    def _hash(fpath):
+        try:
+            return prefix_hash(fpath) if prefix_only else file_hash(fpath)
+        except Exception as e:
+            logger.error("Error hashing file %s: %s", fpath, e)
+            return None
+
+    if not paths:
+        return {}
+    if max_workers > 1 and len(paths) > 1:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(paths))) as executor:
+            results = list(executor.map(_hash, paths))
+    else:
+        results = [_hash(fpath) for fpath in paths]
+    return {fpath: h for fpath, h in zip(paths, results) if h is not None}
+
+def find_duplicates(groups: dict, logger: logging.Logger, max_workers: int = 1) -> list:
+    """
+    Finds byte-identical files within {size: [paths]} groups of same-size files.
+    Files are compared by a hash of their first PREFIX_HASH_SIZE bytes, and whole files are only
+    hashed when those collide (files no larger than the prefix are already fully covered by it).
+    Returns (duplicate, kept) path pairs; the first path of each set of identical files is the one kept.
+    """
+    prefixes = hash_files([fpath for paths in groups.values() for fpath in paths], logger, max_workers, prefix_only=True)
+    collisions = []
+    for size, paths in groups.items():
+        by_prefix = {}
+        for fpath in paths:
+            if fpath in prefixes:
+                by_prefix.setdefault(prefixes[fpath], []).append(fpath)
+        collisions.extend((size, same) for same in by_prefix.values() if len(same) > 1)
+
+    full_hashes = hash_files([fpath for size, same in collisions if size > PREFIX_HASH_SIZE for fpath in same], logger, max_workers)
+    duplicates = []
+    for size, same in collisions:
+        hashes = full_hashes if size > PREFIX_HASH_SIZE else prefixes
+        seen = {}
+        for fpath in same:
+            h = hashes.get(fpath)
+            if h is None:
+                continue
+            if h in seen:
+                duplicates.append((fpath, seen[h]))
+            else:
+                seen[h] = fpath
+    return duplicates
+
+def dedupe_directory(directory: str, audio_extensions: frozenset, logger: logging.Logger, max_workers: int = 1, tag_cache: TagCache | None = None, bitrate_cache: dict | None = None) -> dict:
+    """
+    Removes byte-identical audio files from a directory and returns {removed path: path of the identical file kept}.
+    Only files sharing a size can be identical, so files with a unique size are never read.
+    """
+    groups = {}
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.name[entry.name.rfind('.'):].lower() in audio_extensions and entry.is_file():
+                groups.setdefault(entry.stat().st_size, []).append(entry.path)
+    groups = {size: paths for size, paths in groups.items() if len(paths) > 1}
+
+    removed = {}
+    for fpath, kept in find_duplicates(groups, logger, max_workers):
+        try:
+            os.remove(fpath)
+            if bitrate_cache is not None:
+                bitrate_cache.pop(fpath, None)
+            if tag_cache is not None:
+                tag_cache.discard(fpath)
+            removed[fpath] = kept
+            logger.info("Removed duplicate file by hash: %s (kept %s)", fpath, kept)
+        except Exception as e:
+            logger.error("Error removing duplicate file %s: %s", fpath, e)
+    return removed
+
+def playlist_entry(filepath: str, file_info: TrackTags, original_filename: str) -> dict:
+    """
+    Builds the file info dictionary used for playlist generation.
+    The #EXTINF duration, title and artist are resolved here, once per file, so the playlist writer only formats them.
+    """
+    tags = file_info.tags
+    return {
+        'filepath': filepath,
+        'tags': tags,
+        'original_filename': original_filename,
+        'duration': tags.get('LENGTH', '') or file_info.length or -1,
+        'display_title': first_tag(tags, _TITLE_KEYS) or os.path.splitext(os.path.basename(filepath))[0],
+        'display_artist': first_tag(tags, _TRACK_ARTIST_KEYS) or 'Unknown Artist',
+    }
+
+def iter_audio_files(root: str, audio_extensions: frozenset):
+    """
+    Yields the DirEntry of every audio file under root, recursively, without following directory symlinks.
+    Uses os.scandir directly so file type and extension checks need no extra stat calls; unreadable directories are skipped like os.walk does.
+    """
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name[entry.name.rfind('.'):].lower() in audio_extensions and entry.is_file():
+                        yield entry
+        except OSError:
+            continue
+
+def collect_all_audio_files(storage_directory: str, audio_extensions: frozenset, logger: logging.Logger, max_workers: int = 1, tag_cache: TagCache | None = None) -> list:
     """
     Collect all audio files from the storage directory for playlist generation.
+    Tags are read in parallel processes when max_workers > 1, and through tag_cache when given.
     Returns a list of file info dictionaries.
     """
-    all_files = []
+    found = [(entry.path, entry.name) for entry in iter_audio_files(storage_directory, audio_extensions)]
     
-    for root, dirs, files in os.walk(storage_directory):
-        for file in files:
-            if file.lower().endswith(audio_extensions):
-                filepath = os.path.join(root, file)
-                try:
-                    # Extract tags for each file
-                    file_info = audio_tag(filepath, logger)
-                    all_files.append({
-                        'filepath': filepath,
-                        'tags': file_info['tags'],
-                        'original_filename': file
-                    })
-                except Exception as e:
-                    logger.debug(f"Error processing {filepath} for playlist: {e}")
-    
-    logger.debug(f"Collected {len(all_files)} audio files from storage directory for playlist")
+    # Extract tags for each file
+    file_infos = read_tags([filepath for filepath, _ in found], logger, max_workers, tag_cache)
+    all_files = [playlist_entry(filepath, file_info, file) for (filepath, file), file_info in zip(found, file_infos)]
+    
+    logger.debug("Collected %s audio files from storage directory for playlist", len(all_files))
     return all_files
 
 def generate_playlists(all_files: list, storage_directory: str, logger: logging.Logger, config=None, playlist_name=None, playlist_dir_override=None) -> None:
     """
     Generate a playlist based on all audio files in the storage directory.
-    Creates a single playlist with all audio tracks.
+    Creates a single playlist with all audio tracks, given as playlist_entry dictionaries.
     """
     if not all_files:
         logger.info("No audio files found in storage directory. Skipping playlist generation.")
@@ -335,11 +806,13 @@ def generate_playlists(all_files: list, storage_directory: str, logger: logging.
         else:
             playlist_name = 'Music Collection'
     
-    playlist_name = playlist_name.replace('{date}', time.strftime('%Y-%m-%d'))
-    playlist_name = playlist_name.replace('{time}', time.strftime('%H-%M-%S'))
-    playlist_name = playlist_name.replace('{datetime}', time.strftime('%Y-%m-%d_%H-%M-%S'))
+    # Read the clock once so the name and the header show the same moment
+    now = time.localtime()
+    playlist_name = playlist_name.replace('{date}', time.strftime('%Y-%m-%d', now))
+    playlist_name = playlist_name.replace('{time}', time.strftime('%H-%M-%S', now))
+    playlist_name = playlist_name.replace('{datetime}', time.strftime('%Y-%m-%d_%H-%M-%S', now))
     
-    logger.info(f"Generating playlist '{playlist_name}' for {len(all_files)} audio files...")
+    logger.info("Generating playlist '%s' for %s audio files...", playlist_name, len(all_files))
     
     # Get playlist directory from config or use storage directory root
     playlist_dir = storage_directory  # Default to storage root
@@ -371,33 +844,34 @@ def generate_playlists(all_files: list, storage_directory: str, logger: logging.
     safe_playlist_name = clean_string(playlist_name)
     playlist_path = os.path.join(playlist_dir, f"{safe_playlist_name}.m3u")
     try:
-        with open(playlist_path, 'w', encoding='utf-8') as f:
-            f.write("#EXTM3U\n")
-            f.write(f"# {playlist_name} Playlist - Generated on {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"# Total tracks: {len(all_files)}\n\n")
+        # Build the whole playlist in memory and write it in one call
+        lines = [
+            "#EXTM3U",
+            f"# {playlist_name} Playlist - Generated on {time.strftime('%Y-%m-%d %H:%M:%S', now)}",
+            f"# Total tracks: {len(all_files)}",
+            "",
+        ]
+        # Tracks under the playlist directory only need the prefix cut off;
+        # relpath (which resolves both paths against the cwd each call) is left for the rest
+        playlist_prefix = os.path.join(playlist_dir, '')
+        playlist_base = os.path.abspath(playlist_dir)
+        
+        for file_info in all_files:
+            filepath = file_info['filepath']
             
-            for file_info in all_files:
-                filepath = file_info['filepath']
-                tags = file_info['tags']
-                
-                # Get track info for extended M3U format
-                title = tags.get('TIT2') or tags.get('TITLE') or os.path.splitext(os.path.basename(filepath))[0]
-                artist = tags.get('TPE1') or tags.get('ARTIST') or 'Unknown Artist'
-                duration = tags.get('LENGTH', '')
-                
-                # Write extended info line
-                if duration:
-                    f.write(f"#EXTINF:{duration},{artist} - {title}\n")
-                else:
-                    f.write(f"#EXTINF:-1,{artist} - {title}\n")
-                
-                # Write relative path from playlist directory
-                rel_path = os.path.relpath(filepath, playlist_dir)
-                f.write(f"{rel_path}\n")
+            # Extended info line (fields precomputed by playlist_entry), then the relative path from the playlist directory
+            lines.append(f"#EXTINF:{file_info['duration']},{file_info['display_artist']} - {file_info['display_title']}")
+            if filepath.startswith(playlist_prefix):
+                lines.append(os.path.normpath(filepath[len(playlist_prefix):]))
+            else:
+                lines.append(os.path.relpath(filepath, playlist_base))
+        
+        with open(playlist_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
         
-        logger.info(f"Created playlist '{playlist_name}' with {len(all_files)} tracks at '{playlist_path}'")
+        logger.info("Created playlist '%s' with %s tracks at '%s'", playlist_name, len(all_files), playlist_path)
     except Exception as e:
-        logger.error(f"Error creating playlist '{playlist_name}': {e}")
+        logger.error("Error creating playlist '%s': %s", playlist_name, e)
 
 def main(source_directory: str, storage_directory: str, logger: logging.Logger, audio_extensions=None, config=None, playlist_name=None, playlist_dir=None) -> None:
     """
@@ -409,194 +883,211 @@ def main(source_directory: str, storage_directory: str, logger: logging.Logger,
     
     # Use provided extensions or defaults
     if audio_extensions is None:
-        audio_extensions = ('.mp3', '.flac', '.ogg', '.mp4', '.m4a', '.wma', '.aac', '.opus')
+        audio_extensions = DEFAULT_AUDIO_EXTENSIONS
+    hash_workers = get_hash_workers(config)
+    
+    # Compare devices once: across filesystems every rename would fail with EXDEV, so copy directly
+    try:
+        same_fs = os.stat(source_directory).st_dev == os.stat(storage_directory).st_dev
+    except FileNotFoundError:
+        same_fs = True  # storage not created yet; _fast_move still falls back per file
+    move_file = _fast_move if same_fs else shutil.move
     
     # List all audio files in the base directory
-    audio_files = [f for f in os.listdir(source_directory) if f.lower().endswith(audio_extensions)]
-    stat_total_files = len(audio_files)
-    stat_duplicates = 0
-    stat_removed = 0
-    stat_updated = 0
-    stat_newly_added = 0
-    processed_files = []  # Track all processed files for playlist generation
-
-    for audio_file in audio_files:
-        file_path = os.path.join(source_directory, audio_file)
-        mp3_info = audio_tag(file_path, logger)
-        logger.debug(f"{audio_file}: {mp3_info['tags']}")
-
-        # Get the artist name and create a directory for the artist.
-        # If the artist tag is not present, use the first part of the filename as a fallback and add to the tag.
-        # Handle different tag formats for different audio formats
-        artist = None
-        if 'TPE2' in mp3_info['tags']:  # ID3 album artist
-            artist = mp3_info['tags']['TPE2']
-        elif 'TPE1' in mp3_info['tags']:  # ID3 artist
-            artist = mp3_info['tags']['TPE1']
-        elif 'ALBUMARTIST' in mp3_info['tags']:  # Vorbis/FLAC album artist
-            artist = mp3_info['tags']['ALBUMARTIST']
-        elif 'ARTIST' in mp3_info['tags']:  # Vorbis/FLAC artist
-            artist = mp3_info['tags']['ARTIST']
-        elif '\xa9ART' in mp3_info['tags']:  # iTunes artist
-            artist = mp3_info['tags']['\xa9ART']
-        elif 'aART' in mp3_info['tags']:  # iTunes album artist
-            artist = mp3_info['tags']['aART']
-        else:
-            artist = audio_file.split('-')[0].strip()
+    with os.scandir(source_directory) as it:
+        audio_files = [entry for entry in it if entry.name[entry.name.rfind('.'):].lower() in audio_extensions and entry.is_file()]
+    # Read all tags up front in worker processes; moving and removing files below stays in this process
+    tag_cache = None
+    tag_cache_path = get_tag_cache_path(config)
+    if tag_cache_path:
+        try:
+            tag_cache = TagCache(tag_cache_path, logger)
+        except sqlite3.Error as e:
+            logger.warning("Tag cache %s unavailable, reading all tags: %s", tag_cache_path, e)
+    try:
+        audio_infos = read_tags([entry.path for entry in audio_files], logger, get_tag_workers(config), tag_cache)
+        stat_total_files = len(audio_files)
+        stat_duplicates = 0
+        stat_removed = 0
+        stat_updated = 0
+        stat_newly_added = 0
+        processed_files = []  # Track all processed files for playlist generation
+        touched_dirs = set()  # Artist/album directories created or used this run, checked for duplicates once all files are moved
+        bitrate_cache = {}  # Bit rates of files moved into storage during this run: {path: bitrate}
+
+        for entry, mp3_info in zip(audio_files, audio_infos):
+            audio_file = entry.name
+            file_path = entry.path
+            logger.debug("%s: %s", audio_file, mp3_info.tags)
+
+            # Get the artist name and create a directory for the artist.
+            # If the artist tag is not present, use the first part of the filename as a fallback and add to the tag.
+            # audio_tag already resolved the format-specific tag keys (ID3, Vorbis/FLAC, iTunes)
+            artist = mp3_info.artist
+            if artist is None:
+                artist = audio_file.split('-')[0].strip()
         
-        artist = clean_string(artist)
+            artist = clean_string(artist)
         
-        # Fix title if it is not present
-        title = None
-        if 'TIT2' in mp3_info['tags']:  # ID3 title
-            title = mp3_info['tags']['TIT2']
-        elif 'TITLE' in mp3_info['tags']:  # Vorbis/FLAC title
-            title = mp3_info['tags']['TITLE']
-        elif '\xa9nam' in mp3_info['tags']:  # iTunes title
-            title = mp3_info['tags']['\xa9nam']
-        else:
-            title = audio_file.split('-')[1].strip() if '-' in audio_file else os.path.splitext(audio_file)[0]
+            # Fix title if it is not present
+            title = mp3_info.title
+            if title is None:
+                title = audio_file.split('-')[1].strip() if '-' in audio_file else os.path.splitext(audio_file)[0]
         
-        title = clean_string(title)
-        mp3_info['tags']['TIT2'] = title
+            title = clean_string(title)
+            mp3_info.title = title
+            mp3_info.tags['TIT2'] = title
         
-        if artist:
-            artist_directory = os.path.join(storage_directory, artist)
-            os.makedirs(artist_directory, exist_ok=True)
-
-            # get album name and create a subdirectory for the album if it exists
-            # Handle different tag formats for album
-            album = None
-            if 'TALB' in mp3_info['tags']:  # ID3 album
-                album = mp3_info['tags']['TALB']
-            elif 'ALBUM' in mp3_info['tags']:  # Vorbis/FLAC album
-                album = mp3_info['tags']['ALBUM']
-            elif '\xa9alb' in mp3_info['tags']:  # iTunes album
-                album = mp3_info['tags']['\xa9alb']
-            
-            if album and album.strip():
-                album = clean_string(album.strip())
-                if artist != album:
-                    artist_directory = os.path.join(artist_directory, album)
+            if artist:
+                artist_directory = os.path.join(storage_directory, artist)
+
+                # get album name and use a subdirectory for the album if it exists
+                album = mp3_info.album
+                if album and album.strip():
+                    album = clean_string(album.strip())
+                    if artist != album:
+                        artist_directory = os.path.join(artist_directory, album)
+
+                # Create the artist (and album) directory the first time this run needs it, not for every file
+                if artist_directory not in touched_dirs:
                     os.makedirs(artist_directory, exist_ok=True)
+                    touched_dirs.add(artist_directory)
 
-            # Move the file to the artist's directory and remove duplicates
-            audio_file_size = os.path.getsize(file_path)
-            audio_file_size_destination = os.path.getsize(os.path.join(artist_directory, audio_file)) if os.path.exists(os.path.join(artist_directory, audio_file)) else -1
-            
-            # Get bitrate for source file
-            try:
-                source_audio = File(file_path)
-                bit_rate_source = source_audio.info.bitrate if source_audio and source_audio.info else 0
-            except:
-                bit_rate_source = 0
-                
-            # Get bitrate for destination file
-            try:
+                # Move the file to the artist's directory and remove duplicates
                 dest_path = os.path.join(artist_directory, audio_file)
-                if os.path.exists(dest_path):
-                    dest_audio = File(dest_path)
-                    bit_rate_destination = dest_audio.info.bitrate if dest_audio and dest_audio.info else 0
-                else:
-                    bit_rate_destination = -1
-            except:
-                bit_rate_destination = -1
+                audio_file_size = mp3_info.size if mp3_info.size is not None else entry.stat().st_size
+                # One stat tells both whether the destination exists and its size
+                try:
+                    audio_file_size_destination = os.stat(dest_path).st_size
+                except FileNotFoundError:
+                    audio_file_size_destination = -1
+            
+                # Source bit rate comes from the tag pass if mutagen read the file, else it is read when a comparison needs it
+                bit_rate_source = mp3_info.bitrate
+                # Whether dest_path holds a file once this track is handled; tracked instead of stat'ed again
+                in_storage = audio_file_size_destination > 0
 
-            if audio_file_size_destination > 0:
-                logger.debug(f"Bit rates of files: \n\tSource file:{bit_rate_source} bps\n\tExisting file: {bit_rate_destination} bps")
-                logger.debug(f"File sizes:\n\tSource file: {audio_file_size}\n\tExisting file: {audio_file_size_destination}")
+                if audio_file_size_destination > 0:
+                    logger.debug("File sizes:\n\tSource file: %s\n\tExisting file: %s", audio_file_size, audio_file_size_destination)
                 
-                if os.path.exists(os.path.join(artist_directory, audio_file)):
                     stat_duplicates += 1
                 
                     if audio_file_size == audio_file_size_destination:
                         os.remove(file_path)
+                        if tag_cache is not None:
+                            tag_cache.discard(file_path)
                         stat_removed += 1
 
                     elif audio_file_size != audio_file_size_destination:
+                        # Bit rates only matter when the sizes differ; the existing file is only
+                        # parsed here, and not at all if it was moved there during this run
+                        bit_rate_destination = storage_bitrate(dest_path, logger, bitrate_cache, tag_cache)
+                        if bit_rate_source is None:
+                            bit_rate_source = file_bitrate(file_path, logger)
+                        logger.debug("Bit rates of files: \n\tSource file:%s bps\n\tExisting file: %s bps", bit_rate_source, bit_rate_destination)
 
-                        if audio_file_size_destination > audio_file_size and bit_rate_destination > bit_rate_source and bit_rate_destination > 0:
+                        if bit_rate_source is None or bit_rate_destination < 0:
+                            # Without both bit rates there is no telling which copy to keep, so neither is touched
+                            logger.warning("Bit rate of %s or %s unknown, leaving both files in place", file_path, dest_path)
+
+                        elif audio_file_size_destination > audio_file_size and bit_rate_destination > bit_rate_source and bit_rate_destination > 0:
                             try:
                                 os.remove(file_path)
+                                if tag_cache is not None:
+                                    tag_cache.discard(file_path)
                                 stat_removed += 1
 
                             except Exception as e:
-                                logger.error(f"Error removing file {file_path}: {e}")
+                                logger.error("Error removing file %s: %s", file_path, e)
 
                         elif audio_file_size > audio_file_size_destination and bit_rate_destination == bit_rate_source and bit_rate_destination > 0:
                             try:
-                                os.remove(os.path.join(artist_directory, audio_file))
-                                shutil.move(file_path, os.path.join(artist_directory, audio_file))
+                                os.remove(dest_path)
+                                move_file(file_path, dest_path)
+                                if tag_cache is not None:
+                                    tag_cache.move(file_path, dest_path, bit_rate_source)
+                                bitrate_cache[dest_path] = bit_rate_source
                                 stat_updated += 1
 
                             except Exception as e:
-                                logger.error(f"Error removing file {os.path.join(artist_directory, audio_file)}: {e}")
+                                logger.error("Error removing file %s: %s", dest_path, e)
+                                in_storage = os.path.exists(dest_path)
 
                         elif audio_file_size < audio_file_size_destination and bit_rate_destination == bit_rate_source and bit_rate_destination > 0:
                             try:
                                 os.remove(file_path)
+                                if tag_cache is not None:
+                                    tag_cache.discard(file_path)
                                 stat_removed += 1
 
                             except Exception as e:
-                                logger.error(f"Error removing file {file_path}: {e}")
+                                logger.error("Error removing file %s: %s", file_path, e)
 
                         elif bit_rate_source > bit_rate_destination:
                             try:
-                                os.remove(os.path.join(artist_directory, audio_file))
-                                shutil.move(file_path, os.path.join(artist_directory, audio_file))
+                                os.remove(dest_path)
+                                move_file(file_path, dest_path)
+                                if tag_cache is not None:
+                                    tag_cache.move(file_path, dest_path, bit_rate_source)
+                                bitrate_cache[dest_path] = bit_rate_source
                                 stat_updated += 1
 
                             except Exception as e:
-                                logger.error(f"Error removing file {os.path.join(artist_directory, audio_file)}: {e}")
+                                logger.error("Error removing file %s: %s", dest_path, e)
+                                in_storage = os.path.exists(dest_path)
 
-            else:
-                try:                    
-                    destination_path = os.path.join(artist_directory, audio_file)
-                    shutil.move(file_path, destination_path)
-                    stat_newly_added += 1
-
-                except Exception as e:
-                    logger.error(f"Error moving file {file_path} to {artist_directory}: {e}")
-                    logger.debug(f"File sizes:\n\tSource: {audio_file_size}\n\tDestination: {audio_file_size_destination}")
-
-            # Track all processed files for playlist generation (regardless of whether newly added, updated, or existing)
-            final_destination_path = os.path.join(artist_directory, audio_file)
-            if os.path.exists(final_destination_path):  # Only add if file exists in storage
-                processed_files.append({
-                    'filepath': final_destination_path,
-                    'tags': mp3_info['tags'],
-                    'original_filename': audio_file
-                })
-
-            # Remove duplicate files with (N) suffix at the end
-            # for i in range(1, 100):
-            #     duplicate_file = os.path.join(artist_directory, mp3_file.replace('.mp3', f' ({i}).mp3'))                
-            #     if os.path.exists(duplicate_file):
-            #         duplicate_file_size = os.path.getsize(duplicate_file)
-            #         if mp3_file_size == duplicate_file_size:
-            #             os.remove(duplicate_file)
-            #             stat_duplicates += 1
-            #             stat_removed += 1
-            #             print(f"Removed duplicate file: {duplicate_file}")
-
-            # Remove duplicate files hashes
-            existing_hashes = {}
-            for fname in os.listdir(artist_directory):
-                if fname.lower().endswith(audio_extensions):
-                    fpath = os.path.join(artist_directory, fname)
+                else:
                     try:
-                        h = file_hash(fpath)
-                        if h in existing_hashes:
-                            # Duplicate found, remove this file
-                            shutil.move(fpath, os.path.join(artist_directory, "to_delete.tmp"))
-                            os.remove(os.path.join(artist_directory, "to_delete.tmp"))
-                            stat_duplicates += 1
-                            stat_removed += 1
-                            logger.info(f"Removed duplicate file by hash: {fpath}")
-                        else:
-                            existing_hashes[h] = fpath
+                        move_file(file_path, dest_path)
+                        if tag_cache is not None:
+                            tag_cache.move(file_path, dest_path, bit_rate_source)
+                        if bit_rate_source is not None:
+                            bitrate_cache[dest_path] = bit_rate_source
+                        stat_newly_added += 1
+                        in_storage = True
+
                     except Exception as e:
-                        logger.error(f"Error hashing file {fpath}: {e}")
+                        logger.error("Error moving file %s to %s: %s", file_path, artist_directory, e)
+                        logger.debug("File sizes:\n\tSource: %s\n\tDestination: %s", audio_file_size, audio_file_size_destination)
+                        in_storage = os.path.exists(dest_path)
+
+                # Track all processed files for playlist generation (regardless of whether newly added, updated, or existing)
+                if in_storage:  # Only add if file exists in storage
+                    processed_files.append(playlist_entry(dest_path, mp3_info, audio_file))
+
+                # Remove duplicate files with (N) suffix at the end
+                # for i in range(1, 100):
+                #     duplicate_file = os.path.join(artist_directory, mp3_file.replace('.mp3', f' ({i}).mp3'))                
+                #     if os.path.exists(duplicate_file):
+                #         duplicate_file_size = os.path.getsize(duplicate_file)
+                #         if mp3_file_size == duplicate_file_size:
+                #             os.remove(duplicate_file)
+                #             stat_duplicates += 1
+                #             stat_removed += 1
+                #             print(f"Removed duplicate file: {duplicate_file}")
+
+        # Remove duplicate files hashes, once per directory this run touched
+        removed_files = {}  # {removed path: identical path kept}
+        for directory in sorted(touched_dirs):
+            removed_files.update(dedupe_directory(directory, audio_extensions, logger, hash_workers, tag_cache, bitrate_cache))
+    finally:
+        if tag_cache is not None:
+            tag_cache.close()
+    stat_duplicates += len(removed_files)
+    stat_removed += len(removed_files)
+    if removed_files:
+        # A track whose copy was removed as a duplicate is still in storage under the kept path; it is
+        # listed there, once, rather than dropped from the playlist
+        listed = {file_info['filepath'] for file_info in processed_files}
+        kept_files = []
+        for file_info in processed_files:
+            kept = removed_files.get(file_info['filepath'])
+            if kept is None:
+                kept_files.append(file_info)
+            elif kept not in listed:
+                kept_files.append(dict(file_info, filepath=kept))
+                listed.add(kept)
+        processed_files = kept_files
 
     # Generate playlists for all processed files
     if processed_files:
@@ -648,20 +1139,8 @@ if __name__ == "__main__":
     except FileNotFoundError:
         config = None
 
-    # Configure logging based on command-line arguments and config
-    logger = setup_logging(args.verbose, args.quiet, args.log_file, config)
-    
-    # Log which tag library is being used
-    if PYTAGLIB_AVAILABLE:
-        logger.info("Using pytaglib for efficient metadata tag handling")
-    else:
-        logger.info("Using mutagen for metadata tag handling (consider installing pytaglib for better performance)")
-    
-    # Get audio extensions from config
-    audio_extensions = get_audio_extensions(config)
-    logger.debug(f"Using audio extensions: {audio_extensions}")
-
     # If arguments are not provided, try to read from mp3tags.ini
+    # (checked before logging is set up, so a mis-invocation exits without opening the log file)
     source_directory = args.source
     storage_directory = args.storage
 
@@ -677,4 +1156,22 @@ if __name__ == "__main__":
         print("Example mp3tags.ini:\n\n[mp3tags]\nsource = C:\\Music\\Unsorted\nstorage = C:\\Music\\Organized\n")
         exit(1)
 
+    if not MUTAGEN_AVAILABLE:
+        print("Error: mutagen is required to compare bit rates of duplicate files. Install it with: pip install mutagen")
+        exit(1)
+
+    # Configure logging based on command-line arguments and config
+    logger = setup_logging(args.verbose, args.quiet, args.log_file, config)
+    
+    # Log which tag library is being used
+    if PYTAGLIB_AVAILABLE:
+        logger.info("Using pytaglib for efficient metadata tag handling")
+    else:
+        logger.info("Using mutagen for metadata tag handling (consider installing pytaglib for better performance)")
+    
+    # Get audio extensions from config
+    audio_extensions = get_audio_extensions(config)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Using audio extensions: %s", sorted(audio_extensions))
+
     main(source_directory, storage_directory, logger, audio_extensions, config, args.playlist_name, args.playlist_dir)
\ No newline at end of file